@@ -1,11 +1,39 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, send_file, after_this_request
 from model import Shipment, SimulationData, MeansEndAgent, RankingAlgorithm, generate_route_report, advanced_simulation, elaborate_report, QuantumAnnealingRouteOptimizer, fuzzy_logic_ranking, deep_route_predictor, predict_route_quality, compute_sustainability_index, compute_resilience_factor, logistics_innovation_score
 import random
 import math
 from datetime import datetime, timedelta
 import numpy as np
+import os
+import shutil
+import tempfile
+import threading
+import pandas as pd
+from bulk import process_file, file_format, parse_chunk, REQUIRED_COLUMNS
+from consolidation import consolidate, consolidation_summary, SHIPMENT_COLUMNS
+from timetable import Timetable, simulate_timetable, timetable_report
+from jobs import JobManager, JobQueueFull
 
 app = Flask(__name__)
+SIMULATED_TIMETABLE_DAYS = 14
+_timetable = None
+_timetable_expires = None
+_timetable_lock = threading.Lock()
+job_manager = JobManager(max_workers=int(os.environ.get('KAALPATH_JOB_WORKERS', 2)))
+
+def get_timetable():
+    global _timetable, _timetable_expires
+    with _timetable_lock:
+        if _timetable is None or (_timetable_expires is not None and datetime.now() >= _timetable_expires):
+            path = os.environ.get('KAALPATH_TIMETABLE')
+            if path:
+                _timetable = Timetable.load(path)
+                _timetable_expires = None
+            else:
+                start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+                _timetable = Timetable(simulate_timetable(SimulationData(), start, days=SIMULATED_TIMETABLE_DAYS))
+                _timetable_expires = start + timedelta(days=SIMULATED_TIMETABLE_DAYS // 2)
+        return _timetable
 
 @app.route('/simulate', methods=['POST'])
 def simulate():
@@ -36,6 +64,76 @@ def assemble_route():
     report['score'] = best_score
     return jsonify({'best_route': report})
 
+@app.route('/bulk_shipment', methods=['POST'])
+def bulk_shipment():
+    upload = request.files.get('file')
+    if upload is None or not upload.filename:
+        return jsonify({'error': 'no file uploaded'}), 400
+    output_format = request.args.get('format', 'csv')
+    chunk_size = request.args.get('chunk_size', 10000, type=int)
+    assemble = request.args.get('assemble', 'true').lower() != 'false'
+    try:
+        input_format = file_format(upload.filename)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    if output_format not in ('csv', 'parquet') or chunk_size <= 0:
+        return jsonify({'error': 'format must be csv or parquet and chunk_size must be positive'}), 400
+    workdir = tempfile.mkdtemp(prefix='kaalpath_bulk_')
+    @after_this_request
+    def cleanup(response):
+        shutil.rmtree(workdir, ignore_errors=True)
+        return response
+    input_path = os.path.join(workdir, 'input.' + input_format)
+    output_path = os.path.join(workdir, 'results.' + output_format)
+    upload.save(input_path)
+    try:
+        summary = process_file(input_path, output_path, chunk_size=chunk_size, assemble=assemble)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    response = send_file(output_path, as_attachment=True, download_name='shipment_results.' + output_format)
+    response.headers['X-Rows-Total'] = str(summary['rows'])
+    response.headers['X-Rows-Valid'] = str(summary['valid'])
+    response.headers['X-Rows-Invalid'] = str(summary['invalid'])
+    return response
+
+@app.route('/consolidate', methods=['POST'])
+def consolidate_shipments():
+    data = request.json
+    records = data.get('shipments') or []
+    window_days = int(data.get('window_days', 3))
+    if window_days <= 0:
+        return jsonify({'error': 'window_days must be positive'}), 400
+    df = parse_chunk(pd.DataFrame(records, columns=REQUIRED_COLUMNS))
+    valid = df['error'].isna()
+    errors = [{'row': int(i), 'shipment_id': None if pd.isna(sid) else str(sid), 'error': err} for i, sid, err in zip(df.index[~valid], df.loc[~valid, 'shipment_id'], df.loc[~valid, 'error'])]
+    plans, allocations, unplaced = consolidate(df.loc[valid, SHIPMENT_COLUMNS], window_days=window_days)
+    errors.extend({'row': int(row), 'shipment_id': str(sid), 'error': err} for row, sid, err in zip(unplaced['row'], unplaced['shipment_id'], unplaced['error']))
+    errors.sort(key=lambda e: e['row'])
+    plans['window_start'] = pd.to_datetime(plans['window_start']).dt.strftime('%Y-%m-%d')
+    return jsonify({
+        'summary': consolidation_summary(plans, allocations, unplaced),
+        'plans': plans.to_dict(orient='records'),
+        'allocations': allocations.to_dict(orient='records'),
+        'errors': errors
+    })
+
+@app.route('/timetable_route', methods=['POST'])
+def timetable_route():
+    data = request.json
+    departure = data.get('departure') or datetime.now().isoformat()
+    route = get_timetable().earliest_arrival(data.get('origin'), data.get('destination'), departure)
+    if route is None:
+        return jsonify({'error': 'no scheduled connection found'}), 404
+    return jsonify({'route': timetable_report(route)})
+
+@app.route('/timetable_profile', methods=['POST'])
+def timetable_profile():
+    data = request.json
+    start = data.get('start') or datetime.now().isoformat()
+    end = data.get('end') or (datetime.fromisoformat(start) + timedelta(days=1)).isoformat()
+    routes = get_timetable().profile(data.get('origin'), data.get('destination'), start, end)
+    return jsonify({'routes': [timetable_report(route) for route in routes]})
+
 @app.route('/rank', methods=['POST'])
 def rank_routes():
     data = request.json
@@ -52,32 +150,90 @@ def rank_routes():
         ranked_reports.append(rep)
     return jsonify({'ranked_routes': ranked_reports})
 
-@app.route('/stats', methods=['GET'])
-def statistics():
-    routes_collection = []
+def run_statistics(samples=10, progress=None):
+    all_scores = []
     sim = SimulationData()
-    for i in range(10):
+    for i in range(samples):
         shipment = Shipment(i, random.choice(sim.locations), random.choice(sim.locations), random.uniform(50, 1500), random.uniform(10, 500), random.choice(['fragile', 'non-fragile', 'hazardous']), datetime.now() + timedelta(days=random.randint(1, 30)))
         agent = MeansEndAgent()
         evaluated = agent.plan_route(shipment, sim)
-        routes_collection.append((shipment, evaluated))
-    all_scores = []
-    for shipment, routes in routes_collection:
-        for route, score in routes:
-            all_scores.append(score)
+        all_scores.extend(score for route, score in evaluated)
+        if progress is not None:
+            progress((i + 1) / samples, {'samples_done': i + 1, 'average_score': sum(all_scores) / len(all_scores)})
     avg_score = sum(all_scores) / len(all_scores) if all_scores else 0
-    return jsonify({'average_score': avg_score})
+    return {'average_score': avg_score}
 
-@app.route('/quantum_analysis', methods=['POST'])
-def quantum_analysis():
-    data = request.json
+def run_quantum_analysis(data, iterations=100, count=10, progress=None):
     shipment = Shipment(data.get('shipment_id'), data.get('origin'), data.get('destination'), data.get('weight'), data.get('volume'), data.get('cargo_type'), datetime.strptime(data.get('shipping_date'), '%Y-%m-%d'))
     sim = SimulationData()
-    routes = advanced_simulation(sim, shipment.origin, shipment.destination, count=10)
-    optimizer = QuantumAnnealingRouteOptimizer(iterations=100)
-    best_route, best_score = optimizer.optimize(routes)
+    routes = advanced_simulation(sim, shipment.origin, shipment.destination, count=count)
+    optimizer = QuantumAnnealingRouteOptimizer(iterations=iterations)
+    callback = None
+    if progress is not None:
+        best = {}
+        def callback(i, best_route, best_score):
+            if best_route is not best.get('route'):
+                best['route'] = best_route
+                best['partial'] = {'best_score': float(best_score), 'best_route': generate_route_report(best_route)}
+            progress(i / iterations, best['partial'])
+    best_route, best_score = optimizer.optimize(routes, callback=callback)
     report = elaborate_report(best_route, shipment)
-    return jsonify({'quantum_report': report})
+    return {'quantum_report': report}
+
+@app.route('/stats', methods=['GET'])
+def statistics():
+    return jsonify(run_statistics())
+
+@app.route('/quantum_analysis', methods=['POST'])
+def quantum_analysis():
+    return jsonify(run_quantum_analysis(request.json))
+
+@app.route('/jobs/quantum_analysis', methods=['POST'])
+def submit_quantum_job():
+    data = request.json
+    iterations = int(data.get('iterations', 100))
+    count = int(data.get('route_count', 10))
+    if iterations <= 0 or count <= 0:
+        return jsonify({'error': 'iterations and route_count must be positive'}), 400
+    try:
+        datetime.strptime(data.get('shipping_date') or '', '%Y-%m-%d')
+    except ValueError:
+        return jsonify({'error': 'shipping_date must be YYYY-MM-DD'}), 400
+    try:
+        job = job_manager.submit('quantum_analysis', lambda job, **params: run_quantum_analysis(progress=job.update, **params), data=data, iterations=iterations, count=count)
+    except JobQueueFull as e:
+        return jsonify({'error': str(e)}), 503
+    return jsonify({'job_id': job.job_id, 'status': job.status}), 202
+
+@app.route('/jobs/stats', methods=['POST'])
+def submit_stats_job():
+    data = request.get_json(silent=True) or {}
+    samples = int(data.get('samples', 10))
+    if samples <= 0:
+        return jsonify({'error': 'samples must be positive'}), 400
+    try:
+        job = job_manager.submit('stats', lambda job, **params: run_statistics(progress=job.update, **params), samples=samples)
+    except JobQueueFull as e:
+        return jsonify({'error': str(e)}), 503
+    return jsonify({'job_id': job.job_id, 'status': job.status}), 202
+
+@app.route('/jobs', methods=['GET'])
+def list_jobs():
+    return jsonify({'jobs': [{k: v for k, v in job.to_dict().items() if k not in ('partial', 'result')} for job in job_manager.list()]})
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'error': 'unknown job'}), 404
+    return jsonify(job.to_dict())
+
+@app.route('/jobs/<job_id>', methods=['DELETE'])
+def cancel_job(job_id):
+    job = job_manager.cancel(job_id)
+    if job is None:
+        return jsonify({'error': 'unknown job'}), 404
+    return jsonify({'job_id': job.job_id, 'status': job.status})
 
 @app.route('/fuzzy_logic_ranking', methods=['POST'])
 def fuzzy_logic_ranking_endpoint():
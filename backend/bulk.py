@@ -0,0 +1,175 @@
+import os
+import argparse
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from datetime import datetime
+from model import Shipment, SimulationData, MeansEndAgent, generate_route_report
+
+REQUIRED_COLUMNS = ['shipment_id', 'origin', 'destination', 'weight', 'volume', 'cargo_type', 'shipping_date']
+REPORT_COLUMNS = ['total_distance', 'total_cost', 'total_time', 'overall_efficiency', 'feasibility', 'sustainability_index']
+OUTPUT_SCHEMA = pa.schema(
+    [('row', pa.int64()), ('shipment_id', pa.string()), ('origin', pa.string()), ('destination', pa.string()),
+     ('weight', pa.float64()), ('volume', pa.float64()), ('cargo_type', pa.string()), ('shipping_date', pa.timestamp('ns')),
+     ('risk_factor', pa.float64()), ('time_factor', pa.float64()), ('score', pa.float64()), ('modes', pa.string())] +
+    [(col, pa.float64()) for col in REPORT_COLUMNS] +
+    [('error', pa.string())]
+)
+
+def file_format(path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext in ('.parquet', '.pq'):
+        return 'parquet'
+    if ext == '.csv':
+        return 'csv'
+    raise ValueError(f'Unsupported file type: {path}')
+
+def read_chunks(path, chunk_size=10000):
+    if file_format(path) == 'parquet':
+        pf = pq.ParquetFile(path)
+        missing = [col for col in REQUIRED_COLUMNS if col not in pf.schema_arrow.names]
+        if missing:
+            raise ValueError(f'Missing columns: {", ".join(missing)}')
+        for batch in pf.iter_batches(batch_size=chunk_size, columns=REQUIRED_COLUMNS):
+            yield batch.to_pandas()
+    else:
+        reader = pd.read_csv(path, chunksize=chunk_size, dtype=str, skipinitialspace=True)
+        for chunk in reader:
+            missing = [col for col in REQUIRED_COLUMNS if col not in chunk.columns]
+            if missing:
+                raise ValueError(f'Missing columns: {", ".join(missing)}')
+            yield chunk[REQUIRED_COLUMNS]
+
+def _text_column(series):
+    text = series.astype('string').str.strip()
+    return text.mask(text == '')
+
+def parse_chunk(chunk):
+    df = pd.DataFrame(index=chunk.index)
+    df['shipment_id'] = _text_column(chunk['shipment_id'])
+    df['origin'] = _text_column(chunk['origin'])
+    df['destination'] = _text_column(chunk['destination'])
+    df['cargo_type'] = _text_column(chunk['cargo_type'])
+    df['weight'] = pd.to_numeric(chunk['weight'], errors='coerce').astype('float64')
+    df['volume'] = pd.to_numeric(chunk['volume'], errors='coerce').astype('float64')
+    dates = chunk['shipping_date']
+    if pd.api.types.is_datetime64_any_dtype(dates):
+        parsed = pd.to_datetime(dates)
+        if parsed.dt.tz is not None:
+            parsed = parsed.dt.tz_convert(None)
+    else:
+        parsed = pd.to_datetime(dates.astype('string').str.strip(), format='%Y-%m-%d', errors='coerce')
+    df['shipping_date'] = parsed.astype('datetime64[ns]')
+    checks = [
+        (df['shipment_id'].isna(), 'missing shipment_id'),
+        (df['origin'].isna(), 'missing origin'),
+        (df['destination'].isna(), 'missing destination'),
+        (df['cargo_type'].isna(), 'missing cargo_type'),
+        (df['weight'].isna(), 'invalid weight'),
+        (df['weight'] < 0, 'weight must be non-negative'),
+        (df['volume'].isna(), 'invalid volume'),
+        (df['volume'] < 0, 'volume must be non-negative'),
+        (df['shipping_date'].isna(), 'invalid shipping_date, expected YYYY-MM-DD'),
+    ]
+    errors = pd.Series('', index=df.index, dtype=object)
+    for mask, message in checks:
+        mask = mask.fillna(False).to_numpy(dtype=bool)
+        errors[mask] = [e + '; ' + message if e else message for e in errors[mask]]
+    df['error'] = errors.mask(errors == '')
+    return df
+
+def score_chunk(df, assemble=True, sim=None):
+    valid = df['error'].isna().to_numpy()
+    n = len(df)
+    df['risk_factor'] = np.nan
+    df['time_factor'] = np.nan
+    weight = df['weight'].to_numpy()[valid]
+    volume = df['volume'].to_numpy()[valid]
+    df.loc[valid, 'risk_factor'] = (weight / (volume + 1)) * np.random.uniform(0.9, 1.3, size=len(weight))
+    days = (df['shipping_date'][valid] - pd.Timestamp(datetime.now())).dt.days
+    df.loc[valid, 'time_factor'] = np.maximum(1, days.to_numpy())
+    df['score'] = np.nan
+    df['modes'] = pd.Series([None] * n, index=df.index, dtype=object)
+    for col in REPORT_COLUMNS:
+        df[col] = np.nan
+    if not assemble or not valid.any():
+        return df
+    sim = sim or SimulationData()
+    rows = df[valid]
+    scores = np.empty(len(rows))
+    modes = []
+    reports = np.empty((len(rows), len(REPORT_COLUMNS)))
+    dates = rows['shipping_date'].to_numpy(dtype=object)
+    for i, (sid, origin, destination, weight, volume, cargo_type) in enumerate(zip(rows['shipment_id'], rows['origin'], rows['destination'], rows['weight'], rows['volume'], rows['cargo_type'])):
+        shipment = Shipment(sid, origin, destination, weight, volume, cargo_type, dates[i])
+        agent = MeansEndAgent()
+        best_route, best_score = agent.plan_route(shipment, sim)[0]
+        report = generate_route_report(best_route)
+        scores[i] = best_score
+        modes.append('-'.join(report['modes']))
+        reports[i] = [report[col] for col in REPORT_COLUMNS]
+    df.loc[valid, 'score'] = scores
+    df.loc[valid, 'modes'] = modes
+    df.loc[valid, REPORT_COLUMNS] = reports
+    return df
+
+class ResultWriter:
+    def __init__(self, path):
+        self.path = path
+        self.format = file_format(path)
+        self.writer = None
+        self.header = True
+    def write(self, df):
+        df = df[OUTPUT_SCHEMA.names]
+        if self.format == 'parquet':
+            if self.writer is None:
+                self.writer = pq.ParquetWriter(self.path, OUTPUT_SCHEMA)
+            self.writer.write_table(pa.Table.from_pandas(df, schema=OUTPUT_SCHEMA, preserve_index=False))
+        else:
+            df.to_csv(self.path, mode='w' if self.header else 'a', header=self.header, index=False, date_format='%Y-%m-%d')
+            self.header = False
+    def close(self):
+        if self.format == 'parquet' and self.writer is None:
+            self.writer = pq.ParquetWriter(self.path, OUTPUT_SCHEMA)
+        if self.writer is not None:
+            self.writer.close()
+        elif self.header:
+            pd.DataFrame(columns=OUTPUT_SCHEMA.names).to_csv(self.path, index=False)
+
+def process_file(input_path, output_path, chunk_size=10000, assemble=True, max_errors=100):
+    summary = {'rows': 0, 'valid': 0, 'invalid': 0, 'errors': []}
+    sim = SimulationData()
+    writer = ResultWriter(output_path)
+    try:
+        for chunk in read_chunks(input_path, chunk_size):
+            df = parse_chunk(chunk.reset_index(drop=True))
+            df.insert(0, 'row', np.arange(summary['rows'], summary['rows'] + len(df), dtype=np.int64))
+            df = score_chunk(df, assemble=assemble, sim=sim)
+            invalid = df[df['error'].notna()]
+            summary['rows'] += len(df)
+            summary['invalid'] += len(invalid)
+            summary['valid'] += len(df) - len(invalid)
+            for row, sid, error in zip(invalid['row'], invalid['shipment_id'], invalid['error']):
+                if len(summary['errors']) >= max_errors:
+                    break
+                summary['errors'].append({'row': int(row), 'shipment_id': None if pd.isna(sid) else str(sid), 'error': error})
+            writer.write(df)
+    finally:
+        writer.close()
+    return summary
+
+def main():
+    parser = argparse.ArgumentParser(description='Bulk shipment risk scoring and route assembly from CSV or Parquet manifests.')
+    parser.add_argument('input', help='input manifest (.csv or .parquet)')
+    parser.add_argument('output', help='output file (.csv or .parquet)')
+    parser.add_argument('--chunk-size', type=int, default=10000)
+    parser.add_argument('--no-assemble', action='store_true', help='only compute risk and time factors')
+    args = parser.parse_args()
+    summary = process_file(args.input, args.output, chunk_size=args.chunk_size, assemble=not args.no_assemble)
+    print(f"Processed {summary['rows']} rows: {summary['valid']} valid, {summary['invalid']} invalid")
+    for err in summary['errors']:
+        print(f"  row {err['row']} ({err['shipment_id']}): {err['error']}")
+
+if __name__ == '__main__':
+    main()
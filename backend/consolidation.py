@@ -0,0 +1,205 @@
+import argparse
+import numpy as np
+import pandas as pd
+from model import SimulationData
+from bulk import read_chunks, parse_chunk
+
+SHIPMENT_COLUMNS = ['shipment_id', 'origin', 'destination', 'weight', 'volume', 'cargo_type', 'shipping_date']
+
+def shipments_to_frame(shipments):
+    return pd.DataFrame({
+        'shipment_id': [s.shipment_id for s in shipments],
+        'origin': [s.origin for s in shipments],
+        'destination': [s.destination for s in shipments],
+        'weight': np.array([s.weight for s in shipments], dtype=float),
+        'volume': np.array([s.volume for s in shipments], dtype=float),
+        'cargo_type': [s.cargo_type for s in shipments],
+        'shipping_date': pd.to_datetime([s.shipping_date for s in shipments]),
+    }, columns=SHIPMENT_COLUMNS)
+
+def first_fit_decreasing(weight, volume, cap_weight, cap_volume):
+    if np.any(weight > cap_weight) or np.any(volume > cap_volume):
+        raise ValueError('Shipment exceeds bin capacity')
+    size = np.maximum(weight / cap_weight, volume / cap_volume)
+    order = np.argsort(-size, kind='stable')
+    n = len(weight)
+    bins = np.empty(n, dtype=np.int64)
+    rem_w = np.empty(n)
+    rem_v = np.empty(n)
+    nbins = 0
+    for i in order:
+        w, v = weight[i], volume[i]
+        fits = np.flatnonzero((rem_w[:nbins] >= w) & (rem_v[:nbins] >= v))
+        if fits.size:
+            b = fits[0]
+        else:
+            b = nbins
+            rem_w[b] = cap_weight
+            rem_v[b] = cap_volume
+            nbins += 1
+        bins[i] = b
+        rem_w[b] -= w
+        rem_v[b] -= v
+    return bins, nbins
+
+def improve_packing(bins, nbins, weight, volume, cap_weight, cap_volume, max_passes=3):
+    if nbins < 2:
+        return bins, nbins
+    size = np.maximum(weight / cap_weight, volume / cap_volume)
+    for _ in range(max_passes):
+        rem_w = cap_weight - np.bincount(bins, weights=weight, minlength=nbins)
+        rem_v = cap_volume - np.bincount(bins, weights=volume, minlength=nbins)
+        load = np.bincount(bins, weights=size, minlength=nbins)
+        alive = np.ones(nbins, dtype=bool)
+        removed = 0
+        for b in np.argsort(load, kind='stable'):
+            members = np.flatnonzero(bins == b)
+            members = members[np.argsort(-size[members], kind='stable')]
+            alive[b] = False
+            trial_w, trial_v = rem_w.copy(), rem_v.copy()
+            moves = []
+            for i in members:
+                fits = np.flatnonzero(alive & (trial_w >= weight[i]) & (trial_v >= volume[i]))
+                if not fits.size:
+                    break
+                target = fits[np.argmin(trial_w[fits] / cap_weight + trial_v[fits] / cap_volume)]
+                trial_w[target] -= weight[i]
+                trial_v[target] -= volume[i]
+                moves.append((i, target))
+            if len(moves) < len(members):
+                alive[b] = True
+                continue
+            for i, target in moves:
+                bins[i] = target
+            rem_w, rem_v = trial_w, trial_v
+            removed += 1
+        if not removed:
+            break
+        remap = np.cumsum(alive) - 1
+        bins = remap[bins]
+        nbins = int(alive.sum())
+    return bins, nbins
+
+def consolidate(shipments, window_days=3, sim=None, improve=True):
+    df = shipments if isinstance(shipments, pd.DataFrame) else shipments_to_frame(shipments)
+    rows = df.index.to_numpy()
+    df = df[SHIPMENT_COLUMNS].reset_index(drop=True)
+    sim = sim or SimulationData()
+    weight = df['weight'].to_numpy(dtype=float)
+    volume = df['volume'].to_numpy(dtype=float)
+    days = pd.to_datetime(df['shipping_date']).to_numpy().astype('datetime64[D]').astype(np.int64)
+    window = (days // window_days) * window_days
+    df['window_start'] = window.astype('datetime64[D]')
+
+    lane_routes = {}
+    plan_of = np.full(len(df), -1, dtype=np.int64)
+    plan_rows = []
+    unplaced = []
+    groups = df.groupby(['origin', 'destination', 'cargo_type', 'window_start'], sort=False).indices
+    for (origin, destination, cargo_type, window_start), idx in groups.items():
+        route = lane_routes.get((origin, destination))
+        if route is None:
+            route = lane_routes[(origin, destination)] = sim.simulate_route(origin, destination)
+        cap_w, cap_v = route.capacity_weight, route.capacity_volume
+        oversize = (weight[idx] > cap_w) | (volume[idx] > cap_v)
+        if oversize.any():
+            unplaced.extend((i, cap_w, cap_v) for i in idx[oversize])
+            idx = idx[~oversize]
+            if not len(idx):
+                continue
+        if len(idx) == 1:
+            bins, nbins = np.zeros(1, dtype=np.int64), 1
+        else:
+            bins, nbins = first_fit_decreasing(weight[idx], volume[idx], cap_w, cap_v)
+            if improve:
+                bins, nbins = improve_packing(bins, nbins, weight[idx], volume[idx], cap_w, cap_v)
+        plan_of[idx] = len(plan_rows) + bins
+        modes = '-'.join(seg.mode for seg in route.segments)
+        for _ in range(nbins):
+            plan_rows.append((origin, destination, cargo_type, window_start, modes, route.total_cost, cap_w, cap_v))
+
+    plans = pd.DataFrame(plan_rows, columns=['origin', 'destination', 'cargo_type', 'window_start', 'modes', 'total_cost', 'capacity_weight', 'capacity_volume'])
+    plans.insert(0, 'plan_id', np.arange(len(plans)))
+    nplans = len(plans)
+    placed = plan_of >= 0
+    plan_of, ids, weight, volume = plan_of[placed], df['shipment_id'].to_numpy()[placed], weight[placed], volume[placed]
+    plans['shipments'] = np.bincount(plan_of, minlength=nplans)
+    plans['total_weight'] = np.bincount(plan_of, weights=weight, minlength=nplans)
+    plans['total_volume'] = np.bincount(plan_of, weights=volume, minlength=nplans)
+    plans['weight_utilisation'] = plans['total_weight'] / plans['capacity_weight']
+    plans['volume_utilisation'] = plans['total_volume'] / plans['capacity_volume']
+    plans['shipment_ids'] = pd.Series(ids, index=plan_of).groupby(level=0).agg(list).reindex(plans['plan_id']).to_numpy()
+
+    cap_w = plans['capacity_weight'].to_numpy()[plan_of]
+    cap_v = plans['capacity_volume'].to_numpy()[plan_of]
+    share = np.maximum(weight / cap_w, volume / cap_v)
+    share_total = np.bincount(plan_of, weights=share, minlength=nplans)[plan_of]
+    count = plans['shipments'].to_numpy()[plan_of]
+    fraction = np.where(share_total > 0, share / np.where(share_total > 0, share_total, 1), 1.0 / count)
+    plan_cost = plans['total_cost'].to_numpy()[plan_of]
+    allocations = pd.DataFrame({
+        'shipment_id': ids,
+        'plan_id': plan_of,
+        'allocated_cost': plan_cost * fraction,
+        'standalone_cost': plan_cost,
+    })
+    allocations['savings'] = allocations['standalone_cost'] - allocations['allocated_cost']
+
+    unplaced_idx = np.array([u[0] for u in unplaced], dtype=np.int64)
+    unplaced = pd.DataFrame({
+        'row': rows[unplaced_idx],
+        'shipment_id': df['shipment_id'].to_numpy()[unplaced_idx],
+        'origin': df['origin'].to_numpy()[unplaced_idx],
+        'destination': df['destination'].to_numpy()[unplaced_idx],
+        'weight': df['weight'].to_numpy(dtype=float)[unplaced_idx],
+        'volume': df['volume'].to_numpy(dtype=float)[unplaced_idx],
+        'capacity_weight': np.array([u[1] for u in unplaced], dtype=float),
+        'capacity_volume': np.array([u[2] for u in unplaced], dtype=float),
+    })
+    unplaced['error'] = [f'exceeds lane capacity of {cw:g} kg / {cv:g} m³' for cw, cv in zip(unplaced['capacity_weight'], unplaced['capacity_volume'])]
+    return plans, allocations, unplaced
+
+def consolidation_summary(plans, allocations, unplaced=None):
+    standalone = float(allocations['standalone_cost'].sum())
+    consolidated = float(plans['total_cost'].sum())
+    return {
+        'shipments': len(allocations),
+        'unplaced': 0 if unplaced is None else len(unplaced),
+        'plans': len(plans),
+        'standalone_cost': standalone,
+        'consolidated_cost': consolidated,
+        'savings': standalone - consolidated,
+        'savings_pct': (standalone - consolidated) / standalone * 100 if standalone else 0.0,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Consolidate pending shipments into shared multi-modal plans.')
+    parser.add_argument('input', help='shipment manifest (.csv or .parquet)')
+    parser.add_argument('plans', help='output CSV of consolidated plans')
+    parser.add_argument('--allocations', default=None, help='output CSV of per-shipment cost allocation')
+    parser.add_argument('--window-days', type=int, default=3)
+    parser.add_argument('--chunk-size', type=int, default=50000)
+    parser.add_argument('--unplaced', default=None, help='output CSV of shipments too large for their lane')
+    parser.add_argument('--no-improve', action='store_true', help='skip the local-search pass')
+    args = parser.parse_args()
+    frames = []
+    skipped = 0
+    for chunk in read_chunks(args.input, args.chunk_size):
+        df = parse_chunk(chunk)
+        valid = df['error'].isna()
+        skipped += int((~valid).sum())
+        frames.append(df.loc[valid, SHIPMENT_COLUMNS])
+    df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=SHIPMENT_COLUMNS)
+    plans, allocations, unplaced = consolidate(df, window_days=args.window_days, improve=not args.no_improve)
+    plans.assign(shipment_ids=plans['shipment_ids'].map(lambda ids: ' '.join(map(str, ids)))).to_csv(args.plans, index=False)
+    if args.allocations:
+        allocations.to_csv(args.allocations, index=False)
+    if args.unplaced:
+        unplaced.to_csv(args.unplaced, index=False)
+    summary = consolidation_summary(plans, allocations, unplaced)
+    print(f"Consolidated {summary['shipments']} shipments into {summary['plans']} plans "
+          f"({skipped} invalid rows skipped, {summary['unplaced']} too large for their lane); cost {summary['standalone_cost']:.2f} -> {summary['consolidated_cost']:.2f} "
+          f"({summary['savings_pct']:.1f}% saved)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+import time
+import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+class JobCancelled(Exception):
+    pass
+
+class JobQueueFull(Exception):
+    pass
+
+class Job:
+    def __init__(self, kind, params):
+        self.job_id = uuid.uuid4().hex
+        self.kind = kind
+        self.params = params
+        self.status = 'queued'
+        self.progress = 0.0
+        self.partial = None
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.future = None
+        self.cancel_event = threading.Event()
+    def update(self, progress, partial=None):
+        if self.cancel_event.is_set():
+            raise JobCancelled()
+        self.progress = min(1.0, max(0.0, progress))
+        if partial is not None:
+            self.partial = partial
+    def is_finished(self):
+        return self.status in ('done', 'failed', 'cancelled')
+    def to_dict(self):
+        return {
+            'job_id': self.job_id,
+            'kind': self.kind,
+            'status': self.status,
+            'cancel_requested': self.cancel_event.is_set(),
+            'progress': self.progress,
+            'partial': self.partial,
+            'result': self.result,
+            'error': self.error,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+        }
+
+class JobManager:
+    def __init__(self, max_workers=2, max_pending=16, ttl=900, max_finished=200):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='kaalpath-job')
+        self.max_pending = max_pending
+        self.ttl = ttl
+        self.max_finished = max_finished
+        self.jobs = {}
+        self.lock = threading.Lock()
+    def submit(self, kind, fn, **params):
+        with self.lock:
+            self._evict()
+            pending = sum(1 for job in self.jobs.values() if not job.is_finished())
+            if pending >= self.max_pending:
+                raise JobQueueFull(f'{pending} jobs already queued or running')
+            job = Job(kind, params)
+            self.jobs[job.job_id] = job
+        job.future = self.executor.submit(self._run, job, fn)
+        return job
+    def _run(self, job, fn):
+        if job.cancel_event.is_set():
+            self._finish(job, 'cancelled')
+            return
+        job.started_at = time.time()
+        job.status = 'running'
+        try:
+            result = fn(job, **job.params)
+        except JobCancelled:
+            self._finish(job, 'cancelled')
+        except Exception as e:
+            self._finish(job, 'failed', error=str(e))
+        else:
+            self._finish(job, 'done', result=result)
+    def _finish(self, job, status, result=None, error=None):
+        with self.lock:
+            if job.is_finished():
+                return
+            job.result = result
+            job.error = error
+            if status == 'done':
+                job.progress = 1.0
+            job.finished_at = time.time()
+            job.status = status
+    def get(self, job_id):
+        with self.lock:
+            self._evict()
+            return self.jobs.get(job_id)
+    def list(self):
+        with self.lock:
+            self._evict()
+            return list(self.jobs.values())
+    def cancel(self, job_id):
+        job = self.get(job_id)
+        if job is None or job.is_finished():
+            return job
+        job.cancel_event.set()
+        if job.future is not None and job.future.cancel():
+            self._finish(job, 'cancelled')
+        return job
+    def _evict(self):
+        now = time.time()
+        finished = sorted((job for job in self.jobs.values() if job.is_finished()), key=lambda job: job.finished_at)
+        expired = [job for job in finished if now - job.finished_at > self.ttl]
+        overflow = finished[len(expired):][:max(0, len(finished) - len(expired) - self.max_finished)]
+        for job in expired + overflow:
+            del self.jobs[job.job_id]
@@ -0,0 +1,247 @@
+import os
+import sys
+import json
+import time
+import random
+import socket
+import argparse
+import threading
+import subprocess
+import numpy as np
+import requests
+from datetime import date, datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+
+CITIES = ["New York", "Los Angeles", "Chicago", "Houston", "Phoenix", "London", "Paris", "Berlin", "Tokyo", "Singapore", "Dubai", "Mumbai"]
+CARGO_TYPES = ["Fragile", "Non-Fragile", "Hazardous"]
+MODES = ["Air", "Sea", "Land"]
+
+def lane_payload():
+    origin, destination = random.sample(CITIES, 2)
+    return {"origin": origin, "destination": destination}
+
+def shipment_payload():
+    payload = lane_payload()
+    payload.update({
+        "shipment_id": random.randint(1, 100000),
+        "weight": round(random.uniform(1.0, 1500.0), 2),
+        "volume": round(random.uniform(1.0, 500.0), 2),
+        "cargo_type": random.choice(CARGO_TYPES),
+        "transport_modes": random.sample(MODES, random.randint(1, len(MODES))),
+        "shipping_date": (date.today() + timedelta(days=random.randint(0, 30))).strftime("%Y-%m-%d")
+    })
+    return payload
+
+def ml_payload():
+    return {"features": [random.uniform(100, 5000), random.uniform(100, 5000), random.uniform(1, 100), random.uniform(0, 100)]}
+
+ENDPOINTS = {
+    "shipment": ("POST", "/shipment", shipment_payload),
+    "assemble": ("POST", "/assemble", shipment_payload),
+    "quantum_analysis": ("POST", "/quantum_analysis", shipment_payload),
+    "simulate": ("POST", "/simulate", lane_payload),
+    "rank": ("POST", "/rank", lane_payload),
+    "fuzzy_logic_ranking": ("POST", "/fuzzy_logic_ranking", lane_payload),
+    "quality": ("POST", "/quality", lane_payload),
+    "ml_predict": ("POST", "/ml_predict", ml_payload),
+    "stats": ("GET", "/stats", None),
+}
+DEFAULT_MIX = "shipment=4,simulate=2,quantum_analysis=1,fuzzy_logic_ranking=1,ml_predict=2"
+
+def parse_mix(spec):
+    names, weights = [], []
+    for item in spec.split(','):
+        name, _, weight = item.strip().partition('=')
+        if name not in ENDPOINTS:
+            raise ValueError(f"Unknown endpoint '{name}', expected one of {', '.join(ENDPOINTS)}")
+        names.append(name)
+        weights.append(float(weight) if weight else 1.0)
+    if sum(weights) <= 0:
+        raise ValueError('Mix weights must sum to a positive value')
+    return names, weights
+
+def wait_for_port(host, port, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=1):
+                return True
+        except OSError:
+            time.sleep(0.2)
+    return False
+
+def port_in_use(host, port):
+    try:
+        with socket.create_connection((host, port), timeout=1):
+            return True
+    except OSError:
+        return False
+
+def start_server(port):
+    if port_in_use('127.0.0.1', port):
+        raise RuntimeError(f'Port {port} is already in use; stop the other server or pass --port/--url')
+    backend_dir = os.path.dirname(os.path.abspath(__file__))
+    cmd = [sys.executable, '-m', 'flask', '--app', 'backend', 'run', '--port', str(port), '--with-threads']
+    proc = subprocess.Popen(cmd, cwd=backend_dir, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    if not wait_for_port('127.0.0.1', port) or proc.poll() is not None:
+        proc.terminate()
+        raise RuntimeError(f'Backend did not start on port {port}')
+    return proc
+
+class LoadGenerator:
+    def __init__(self, base_url, names, weights, timeout=30):
+        self.base_url = base_url.rstrip('/')
+        self.names = names
+        self.weights = weights
+        self.timeout = timeout
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.records = []
+    def session(self):
+        if not hasattr(self.local, 'session'):
+            self.local.session = requests.Session()
+        return self.local.session
+    def pick(self):
+        return random.choices(self.names, weights=self.weights)[0]
+    def send(self, name, scheduled=None):
+        method, path, payload_fn = ENDPOINTS[name]
+        payload = payload_fn() if payload_fn else None
+        start = time.perf_counter()
+        status, ok = None, False
+        try:
+            res = self.session().request(method, self.base_url + path, json=payload, timeout=self.timeout)
+            status, ok = res.status_code, res.status_code < 400
+        except requests.RequestException:
+            pass
+        end = time.perf_counter()
+        latency = end - (scheduled if scheduled is not None else start)
+        with self.lock:
+            self.records.append((name, end, latency, ok, status))
+    def run_closed(self, duration, concurrency, think_time=0.0):
+        stop_at = time.perf_counter() + duration
+        def worker():
+            while time.perf_counter() < stop_at:
+                self.send(self.pick())
+                if think_time > 0:
+                    time.sleep(random.expovariate(1.0 / think_time))
+        threads = [threading.Thread(target=worker, daemon=True) for _ in range(concurrency)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    def run_open(self, duration, rate, max_workers=64):
+        start = time.perf_counter()
+        next_at = start
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            while True:
+                next_at += random.expovariate(rate)
+                if next_at - start >= duration:
+                    break
+                delay = next_at - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                pool.submit(self.send, self.pick(), next_at)
+
+def summarize(records, elapsed):
+    def stats(rows):
+        latencies = np.array([r[2] for r in rows]) * 1000.0
+        errors = sum(1 for r in rows if not r[3])
+        result = {
+            'requests': len(rows),
+            'errors': errors,
+            'error_rate': errors / len(rows) if rows else 0.0,
+            'throughput_rps': len(rows) / elapsed if elapsed > 0 else 0.0,
+        }
+        if len(rows):
+            p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+            result.update({'latency_ms_mean': float(latencies.mean()), 'latency_ms_p50': float(p50), 'latency_ms_p95': float(p95), 'latency_ms_p99': float(p99), 'latency_ms_max': float(latencies.max())})
+        statuses = {}
+        for r in rows:
+            key = str(r[4]) if r[4] is not None else 'exception'
+            statuses[key] = statuses.get(key, 0) + 1
+        result['status_codes'] = statuses
+        return result
+    by_endpoint = {}
+    for r in records:
+        by_endpoint.setdefault(r[0], []).append(r)
+    return {'overall': stats(records), 'endpoints': {name: stats(rows) for name, rows in sorted(by_endpoint.items())}}
+
+def print_report(summary):
+    header = f"{'endpoint':<22}{'reqs':>8}{'err%':>8}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+    print(header)
+    print('-' * len(header))
+    rows = list(summary['endpoints'].items()) + [('overall', summary['overall'])]
+    for name, s in rows:
+        print(f"{name:<22}{s['requests']:>8}{s['error_rate'] * 100:>8.2f}{s['throughput_rps']:>10.2f}"
+              f"{s.get('latency_ms_p50', 0):>10.1f}{s.get('latency_ms_p95', 0):>10.1f}{s.get('latency_ms_p99', 0):>10.1f}")
+
+def print_comparison(summary, baseline):
+    print(f"\n{'endpoint':<22}{'metric':<16}{'baseline':>12}{'current':>12}{'change':>10}")
+    rows = list(summary['endpoints'].items()) + [('overall', summary['overall'])]
+    for name, s in rows:
+        base = baseline['overall'] if name == 'overall' else baseline['endpoints'].get(name)
+        if not base:
+            continue
+        for metric in ('throughput_rps', 'latency_ms_p50', 'latency_ms_p95', 'latency_ms_p99', 'error_rate'):
+            if metric not in s or metric not in base:
+                continue
+            change = (s[metric] - base[metric]) / base[metric] * 100 if base[metric] else 0.0
+            print(f"{name:<22}{metric:<16}{base[metric]:>12.3f}{s[metric]:>12.3f}{change:>9.1f}%")
+
+def main():
+    parser = argparse.ArgumentParser(description='Load-test the KaalPath backend and report latency percentiles and throughput.')
+    parser.add_argument('--url', default=None, help='backend base URL (default: start a local server)')
+    parser.add_argument('--port', type=int, default=5055, help='port for the locally started server')
+    parser.add_argument('--mix', default=DEFAULT_MIX, help='endpoint weights, e.g. shipment=4,quantum_analysis=1')
+    parser.add_argument('--model', choices=['closed', 'open'], default='closed', help='closed-loop workers or open-loop Poisson arrivals')
+    parser.add_argument('--duration', type=float, default=30.0, help='test duration in seconds')
+    parser.add_argument('--concurrency', type=int, default=8, help='closed-loop workers, or open-loop worker cap')
+    parser.add_argument('--rate', type=float, default=20.0, help='open-loop arrival rate in requests per second')
+    parser.add_argument('--think-time', type=float, default=0.0, help='mean closed-loop think time in seconds')
+    parser.add_argument('--timeout', type=float, default=30.0, help='per-request timeout in seconds')
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--output', default=None, help='write the JSON report to this path')
+    parser.add_argument('--compare', default=None, help='JSON report of a previous run to compare against')
+    args = parser.parse_args()
+
+    if args.seed is not None:
+        random.seed(args.seed)
+    names, weights = parse_mix(args.mix)
+    proc = None
+    base_url = args.url
+    if base_url is None:
+        proc = start_server(args.port)
+        base_url = f'http://127.0.0.1:{args.port}'
+    try:
+        gen = LoadGenerator(base_url, names, weights, timeout=args.timeout)
+        started = time.perf_counter()
+        if args.model == 'closed':
+            gen.run_closed(args.duration, args.concurrency, args.think_time)
+        else:
+            gen.run_open(args.duration, args.rate, max_workers=args.concurrency)
+        elapsed = time.perf_counter() - started
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+
+    summary = summarize(gen.records, elapsed)
+    report = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'config': {'url': base_url, 'model': args.model, 'mix': dict(zip(names, weights)), 'duration': args.duration,
+                   'concurrency': args.concurrency, 'rate': args.rate if args.model == 'open' else None,
+                   'think_time': args.think_time, 'timeout': args.timeout, 'seed': args.seed},
+        'elapsed': elapsed,
+        **summary,
+    }
+    print_report(summary)
+    if args.compare:
+        with open(args.compare) as f:
+            print_comparison(summary, json.load(f))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f'\nReport written to {args.output}')
+
+if __name__ == '__main__':
+    main()
@@ -20,14 +20,24 @@ class Shipment:
         diff = (self.shipping_date - now).days
         return max(1, diff)
 
+MODE_CAPACITY = {
+    'air': (20000, 150),
+    'sea': (500000, 2500),
+    'land': (25000, 90),
+    'rail': (120000, 400),
+}
+
 class RouteSegment:
-    def __init__(self, mode, start, end, distance, cost, transit_time):
+    def __init__(self, mode, start, end, distance, cost, transit_time, departure_time=None, arrival_time=None):
         self.mode = mode
         self.start = start
         self.end = end
         self.distance = distance
         self.cost = cost
         self.transit_time = transit_time
+        self.departure_time = departure_time
+        self.arrival_time = arrival_time
+        self.capacity_weight, self.capacity_volume = MODE_CAPACITY.get(mode, (float('inf'), float('inf')))
         self.efficiency = self.calculate_efficiency()
     def calculate_efficiency(self):
         eff = self.distance / (self.transit_time + 1)
@@ -45,6 +55,10 @@ class MultiModalRoute:
         self.total_distance = sum(seg.distance for seg in segments)
         self.total_cost = sum(seg.cost for seg in segments)
         self.total_time = sum(seg.transit_time for seg in segments)
+        self.capacity_weight = min((seg.capacity_weight for seg in segments), default=float('inf'))
+        self.capacity_volume = min((seg.capacity_volume for seg in segments), default=float('inf'))
+        self.departure_time = segments[0].departure_time if segments else None
+        self.arrival_time = segments[-1].arrival_time if segments else None
         self.overall_efficiency = self.compute_overall_efficiency()
         self.feasibility = self.compute_feasibility()
     def compute_overall_efficiency(self):
@@ -154,16 +168,18 @@ def logistics_innovation_score(shipment, route):
 class QuantumAnnealingRouteOptimizer:
     def __init__(self, iterations=50):
         self.iterations = iterations
-    def optimize(self, routes):
+    def optimize(self, routes, callback=None):
         best_score = -float('inf')
         best_route = None
-        for _ in range(self.iterations):
+        for i in range(self.iterations):
             candidate = random.choice(routes)
             perturb = random.uniform(0.95, 1.05)
             score = predict_route_quality(candidate) * perturb
             if score > best_score:
                 best_score = score
                 best_route = candidate
+            if callback is not None:
+                callback(i + 1, best_route, best_score)
         return best_route, best_score
 
 def fuzzy_logic_ranking(routes):
@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import pytest
+from model import SimulationData, RouteSegment, MultiModalRoute, MODE_CAPACITY
+from consolidation import consolidate, consolidation_summary, first_fit_decreasing
+
+class FixedRouteSimulation(SimulationData):
+    def simulate_route(self, origin, destination):
+        return MultiModalRoute([
+            RouteSegment('air', origin, 'X', 800, 1200, 2),
+            RouteSegment('air', 'X', 'Y', 600, 900, 1.5),
+            RouteSegment('rail', 'Y', destination, 400, 300, 6),
+        ])
+
+def make_shipments(weights, volumes):
+    n = len(weights)
+    return pd.DataFrame({
+        'shipment_id': [f'S{i}' for i in range(n)],
+        'origin': ['A'] * n,
+        'destination': ['B'] * n,
+        'weight': np.asarray(weights, dtype=float),
+        'volume': np.asarray(volumes, dtype=float),
+        'cargo_type': ['fragile'] * n,
+        'shipping_date': pd.to_datetime(['2026-11-02'] * n),
+    })
+
+def test_oversized_shipment_is_unplaced():
+    cap_w, cap_v = MODE_CAPACITY['air']
+    df = make_shipments([500, 30000, 800, 1000], [20, 400, 40, cap_v + 1])
+    plans, allocations, unplaced = consolidate(df, sim=FixedRouteSimulation())
+    assert sorted(unplaced['shipment_id']) == ['S1', 'S3']
+    assert list(unplaced['row']) == [1, 3]
+    assert unplaced['error'].str.contains('exceeds lane capacity').all()
+    assert sorted(allocations['shipment_id']) == ['S0', 'S2']
+    assert (plans['weight_utilisation'] <= 1).all()
+    assert (plans['volume_utilisation'] <= 1).all()
+    summary = consolidation_summary(plans, allocations, unplaced)
+    assert summary['shipments'] == 2
+    assert summary['unplaced'] == 2
+    assert summary['plans'] == 1
+
+def test_packing_respects_capacity_and_allocates_full_cost():
+    rng = np.random.default_rng(0)
+    df = make_shipments(rng.uniform(100, 5000, 200), rng.uniform(1, 60, 200))
+    plans, allocations, unplaced = consolidate(df, sim=FixedRouteSimulation())
+    assert unplaced.empty
+    assert sorted(allocations['shipment_id']) == sorted(df['shipment_id'])
+    assert (plans['weight_utilisation'] <= 1 + 1e-9).all()
+    assert (plans['volume_utilisation'] <= 1 + 1e-9).all()
+    assert allocations['allocated_cost'].sum() == pytest.approx(plans['total_cost'].sum())
+
+def test_first_fit_decreasing_rejects_oversized_items():
+    with pytest.raises(ValueError):
+        first_fit_decreasing(np.array([10.0, 50.0]), np.array([1.0, 1.0]), 40.0, 10.0)
@@ -0,0 +1,58 @@
+import time
+import threading
+import jobs
+from jobs import JobManager, JobCancelled
+
+class SlowClock:
+    def time(self):
+        time.sleep(0.005)
+        return time.time()
+
+def wait_finished(manager, job, timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if manager.get(job.job_id).is_finished():
+            return
+        time.sleep(0.001)
+    raise AssertionError('job did not finish')
+
+def test_finished_jobs_always_have_finished_at(monkeypatch):
+    monkeypatch.setattr(jobs, 'time', SlowClock())
+    manager = JobManager(max_workers=2, ttl=60)
+    errors = []
+    stop = threading.Event()
+    def poll():
+        while not stop.is_set():
+            try:
+                for job in manager.list():
+                    if job.is_finished():
+                        assert job.finished_at is not None
+            except Exception as e:
+                errors.append(e)
+    poller = threading.Thread(target=poll)
+    poller.start()
+    try:
+        submitted = [manager.submit('test', lambda job, value: value, value=i) for i in range(20)]
+        for job in submitted:
+            wait_finished(manager, job)
+    finally:
+        stop.set()
+        poller.join()
+    assert not errors
+    assert all(job.status == 'done' and job.result == i for i, job in enumerate(submitted))
+
+def test_cancel_running_job():
+    manager = JobManager(max_workers=1)
+    started = threading.Event()
+    def work(job):
+        started.set()
+        while True:
+            job.update(0.5, {'step': 1})
+            time.sleep(0.001)
+    job = manager.submit('test', work)
+    started.wait(5)
+    manager.cancel(job.job_id)
+    wait_finished(manager, job)
+    assert job.status == 'cancelled'
+    assert job.partial == {'step': 1}
+    assert job.finished_at is not None
@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+from timetable import Timetable, NEVER, to_seconds
+
+BASE = pd.Timestamp('2026-11-01')
+
+def random_timetable(seed, stops=12, connections=600, days=3):
+    rng = np.random.default_rng(seed)
+    dep = rng.integers(0, days * 86400, connections)
+    dur = rng.integers(600, 8 * 3600, connections)
+    origin = rng.integers(0, stops, connections)
+    destination = (origin + rng.integers(1, stops, connections)) % stops
+    return Timetable(pd.DataFrame({
+        'origin': origin.astype(str),
+        'destination': destination.astype(str),
+        'mode': rng.choice(['air', 'sea', 'land', 'rail'], connections),
+        'departure': BASE + pd.to_timedelta(dep, unit='s'),
+        'arrival': BASE + pd.to_timedelta(dep + dur, unit='s'),
+        'distance': dur / 60.0,
+        'cost': dur / 30.0,
+    }))
+
+def sequential_csa(tt, source, t0):
+    earliest = [NEVER] * len(tt.stops)
+    earliest[source] = t0
+    for c in range(len(tt.dep_time)):
+        if tt.dep_time[c] >= t0 and earliest[tt.dep_stop[c]] <= tt.dep_time[c] and tt.arr_time[c] < earliest[tt.arr_stop[c]]:
+            earliest[tt.arr_stop[c]] = tt.arr_time[c]
+    return earliest
+
+def assert_consistent(route, origin, destination, departure):
+    stop, ready = origin, departure
+    for seg in route.segments:
+        assert seg.start == stop
+        assert seg.departure_time >= ready
+        assert seg.arrival_time > seg.departure_time
+        stop, ready = seg.end, seg.arrival_time
+    assert stop == destination
+
+def test_scan_matches_sequential_csa():
+    for seed in range(5):
+        tt = random_timetable(seed)
+        rng = np.random.default_rng(100 + seed)
+        for _ in range(10):
+            source, target = rng.choice(len(tt.stops), 2, replace=False)
+            t0 = to_seconds(BASE + pd.Timedelta(hours=int(rng.integers(0, 48))))
+            earliest, _ = tt._scan(source, target, t0)
+            assert earliest[target] == sequential_csa(tt, source, t0)[target]
+
+def test_earliest_arrival_journey_is_consistent():
+    tt = random_timetable(7)
+    departure = BASE + pd.Timedelta(hours=6)
+    found = 0
+    for origin in tt.stops[:4]:
+        for destination in tt.stops:
+            if origin == destination:
+                continue
+            route = tt.earliest_arrival(origin, destination, departure)
+            if route is None:
+                continue
+            found += 1
+            assert_consistent(route, origin, destination, departure.to_pydatetime())
+            expected = sequential_csa(tt, tt.stop_index[origin], to_seconds(departure))[tt.stop_index[destination]]
+            assert to_seconds(route.arrival_time) == expected
+    assert found
+
+def test_profile_is_pareto_front_of_departures():
+    tt = random_timetable(3, stops=8, connections=400)
+    start, end = BASE + pd.Timedelta(hours=2), BASE + pd.Timedelta(hours=30)
+    origin, destination = tt.stops[0], tt.stops[5]
+    source, target = tt.stop_index[origin], tt.stop_index[destination]
+    candidates = set()
+    for c in np.flatnonzero((tt.dep_stop == source) & (tt.dep_time >= to_seconds(start)) & (tt.dep_time <= to_seconds(end))):
+        if tt.arr_stop[c] == target:
+            arrival = tt.arr_time[c]
+        else:
+            arrival = sequential_csa(tt, tt.arr_stop[c], tt.arr_time[c])[target]
+        if arrival != NEVER:
+            candidates.add((int(tt.dep_time[c]), int(arrival)))
+    expected = sorted((d, a) for d, a in candidates
+                      if not any(d2 >= d and a2 <= a and (d2, a2) != (d, a) for d2, a2 in candidates))
+    routes = tt.profile(origin, destination, start, end, max_duration=pd.Timedelta(days=10))
+    assert [(to_seconds(r.departure_time), to_seconds(r.arrival_time)) for r in routes] == expected
+    for route in routes:
+        assert_consistent(route, origin, destination, route.departure_time)
@@ -0,0 +1,183 @@
+import numpy as np
+import pandas as pd
+from bisect import bisect_right
+from model import RouteSegment, MultiModalRoute, generate_route_report
+from bulk import file_format
+
+CONNECTION_COLUMNS = ['origin', 'destination', 'mode', 'departure', 'arrival']
+MODE_SPEED = {'air': 750.0, 'sea': 35.0, 'land': 65.0, 'rail': 90.0}
+MODE_COST_PER_KM = {'air': 4.0, 'sea': 0.6, 'land': 1.2, 'rail': 0.8}
+NEVER = np.iinfo(np.int64).max
+SCAN_BLOCK = 2048
+PROFILE_MAX_DURATION = pd.Timedelta(days=3)
+
+def to_seconds(value):
+    return int(pd.Timestamp(value).timestamp())
+
+def from_seconds(value):
+    return pd.Timestamp(int(value), unit='s').to_pydatetime()
+
+class Timetable:
+    def __init__(self, connections):
+        missing = [col for col in CONNECTION_COLUMNS if col not in connections.columns]
+        if missing:
+            raise ValueError(f'Missing columns: {", ".join(missing)}')
+        dep = pd.to_datetime(connections['departure']).to_numpy().astype('datetime64[s]').astype(np.int64)
+        arr = pd.to_datetime(connections['arrival']).to_numpy().astype('datetime64[s]').astype(np.int64)
+        keep = arr > dep
+        df = connections[keep]
+        dep, arr = dep[keep], arr[keep]
+        order = np.argsort(dep, kind='stable')
+        stop_codes, self.stops = pd.factorize(pd.concat([df['origin'], df['destination']], ignore_index=True))
+        n = len(df)
+        self.dep_stop = stop_codes[:n][order]
+        self.arr_stop = stop_codes[n:][order]
+        self.dep_time = dep[order]
+        self.arr_time = arr[order]
+        mode_codes, self.modes = pd.factorize(df['mode'])
+        self.mode = mode_codes[order]
+        self.distance = (df['distance'].to_numpy(dtype=float) if 'distance' in df else np.zeros(n))[order]
+        self.cost = (df['cost'].to_numpy(dtype=float) if 'cost' in df else np.zeros(n))[order]
+        self.trip = df['trip_id'].to_numpy()[order] if 'trip_id' in df else None
+        self.stop_index = {stop: i for i, stop in enumerate(self.stops)}
+    @classmethod
+    def load(cls, path):
+        if file_format(path) == 'parquet':
+            return cls(pd.read_parquet(path))
+        return cls(pd.read_csv(path))
+    def __len__(self):
+        return len(self.dep_time)
+    def _scan(self, source, target, t0):
+        # One pass over the departure-sorted connections, processed in fixed-size blocks. Within a block
+        # connections are relaxed together and the block is re-relaxed only for connections made reachable
+        # by an arrival inside the same block, which gives the same result as the sequential scan.
+        earliest = np.full(len(self.stops), NEVER, dtype=np.int64)
+        in_conn = np.full(len(self.stops), -1, dtype=np.int64)
+        earliest[source] = t0
+        lo = np.searchsorted(self.dep_time, t0, side='left')
+        n = len(self.dep_time)
+        while lo < n and self.dep_time[lo] < earliest[target]:
+            hi = min(lo + SCAN_BLOCK, n)
+            dep_stop, dep_time = self.dep_stop[lo:hi], self.dep_time[lo:hi]
+            arr_stop, arr_time = self.arr_stop[lo:hi], self.arr_time[lo:hi]
+            while True:
+                idx = np.flatnonzero((earliest[dep_stop] <= dep_time) & (arr_time < earliest[arr_stop]))
+                if not idx.size:
+                    break
+                stops, times = arr_stop[idx], arr_time[idx]
+                np.minimum.at(earliest, stops, times)
+                won = earliest[stops] == times
+                in_conn[stops[won]] = lo + idx[won]
+            lo = hi
+        return earliest, in_conn
+    def _journey(self, in_conn, source, target):
+        conns = []
+        stop = target
+        while stop != source:
+            c = in_conn[stop]
+            conns.append(c)
+            stop = self.dep_stop[c]
+        return conns[::-1]
+    def _build_route(self, conns):
+        segments = []
+        i = 0
+        while i < len(conns):
+            j = i
+            while (self.trip is not None and j + 1 < len(conns) and not pd.isna(self.trip[conns[i]])
+                   and self.trip[conns[j + 1]] == self.trip[conns[i]]):
+                j += 1
+            first, last = conns[i], conns[j]
+            legs = conns[i:j + 1]
+            segments.append(RouteSegment(
+                self.modes[self.mode[first]], self.stops[self.dep_stop[first]], self.stops[self.arr_stop[last]],
+                float(self.distance[legs].sum()), float(self.cost[legs].sum()),
+                (self.arr_time[last] - self.dep_time[first]) / 3600.0,
+                departure_time=from_seconds(self.dep_time[first]), arrival_time=from_seconds(self.arr_time[last])))
+            i = j + 1
+        return MultiModalRoute(segments)
+    def earliest_arrival(self, origin, destination, departure):
+        if origin not in self.stop_index or destination not in self.stop_index or origin == destination:
+            return None
+        source, target = self.stop_index[origin], self.stop_index[destination]
+        earliest, in_conn = self._scan(source, target, to_seconds(departure))
+        if earliest[target] == NEVER:
+            return None
+        return self._build_route(self._journey(in_conn, source, target))
+    def profile(self, origin, destination, start, end, max_duration=PROFILE_MAX_DURATION):
+        # Reverse profile scan: connections departing in [start, end + max_duration] are visited once in
+        # decreasing departure order, keeping a Pareto list of (departure, arrival at destination) per stop.
+        # Journeys that take longer than max_duration are not considered. The loop is pure Python, so the
+        # cost grows with the number of connections in that time range.
+        if origin not in self.stop_index or destination not in self.stop_index or origin == destination:
+            return []
+        source, target = self.stop_index[origin], self.stop_index[destination]
+        start, end = to_seconds(start), to_seconds(end)
+        lo = np.searchsorted(self.dep_time, start, side='left')
+        hi = np.searchsorted(self.dep_time, end + int(pd.Timedelta(max_duration).total_seconds()), side='right')
+        profiles = {}
+        window = []
+        dep_stops = self.dep_stop[lo:hi].tolist()
+        arr_stops = self.arr_stop[lo:hi].tolist()
+        dep_times = self.dep_time[lo:hi].tolist()
+        arr_times = self.arr_time[lo:hi].tolist()
+        for k in range(hi - lo - 1, -1, -1):
+            stop = arr_stops[k]
+            if stop == target:
+                arrival = arr_times[k]
+            else:
+                entry = _profile_lookup(profiles.get(stop), arr_times[k])
+                if entry is None:
+                    continue
+                arrival = entry[1]
+            dep, c = dep_times[k], lo + k
+            deps, entries = profiles.setdefault(dep_stops[k], ([], []))
+            if not entries or arrival < entries[-1][1]:
+                deps.append(-dep)
+                entries.append((dep, arrival, c))
+            if dep_stops[k] == source and dep <= end and (not window or arrival < window[-1][1]):
+                window.append((dep, arrival, c))
+        routes = []
+        for dep, arrival, c in reversed(window):
+            conns = [c]
+            while self.arr_stop[c] != target:
+                c = _profile_lookup(profiles[self.arr_stop[c]], self.arr_time[c])[2]
+                conns.append(c)
+            routes.append(self._build_route(conns))
+        return routes
+
+def _profile_lookup(profile, t):
+    if profile is None:
+        return None
+    deps, entries = profile
+    i = bisect_right(deps, -t) - 1
+    return entries[i] if i >= 0 else None
+
+def simulate_timetable(sim, start, days=7, seed=None):
+    rng = np.random.default_rng(seed)
+    lanes = [(a, b) for a in sim.locations for b in sim.locations if a != b]
+    rows = []
+    for origin, destination in lanes:
+        distance = rng.uniform(200, 1500)
+        for mode in sim.modes:
+            if rng.random() < 0.5:
+                continue
+            per_day = {'air': 2, 'sea': 0.3, 'land': 4, 'rail': 3}[mode]
+            count = max(1, int(round(per_day * days)))
+            offsets = np.sort(rng.uniform(0, days * 86400, size=count)).astype(np.int64)
+            duration = int(distance / MODE_SPEED[mode] * 3600)
+            for off in offsets:
+                rows.append((origin, destination, mode, off, off + duration, distance, distance * MODE_COST_PER_KM[mode]))
+    df = pd.DataFrame(rows, columns=['origin', 'destination', 'mode', 'departure', 'arrival', 'distance', 'cost'])
+    base = pd.Timestamp(start)
+    df['departure'] = base + pd.to_timedelta(df['departure'], unit='s')
+    df['arrival'] = base + pd.to_timedelta(df['arrival'], unit='s')
+    return df
+
+def timetable_report(route):
+    report = generate_route_report(route)
+    report['departure_time'] = route.departure_time.isoformat()
+    report['arrival_time'] = route.arrival_time.isoformat()
+    report['legs'] = [{'mode': seg.mode, 'start': seg.start, 'end': seg.end,
+                       'departure_time': seg.departure_time.isoformat(), 'arrival_time': seg.arrival_time.isoformat(),
+                       'distance': seg.distance, 'cost': seg.cost} for seg in route.segments]
+    return report
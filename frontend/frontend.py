@@ -6,6 +6,11 @@ import plotly.express as px
 import plotly.graph_objects as go
 from datetime import date, timedelta
 import random
+import time
+
+API_URL = "http://localhost:5000"
+REQUEST_TIMEOUT = 30
+POLL_INTERVAL = 0.5
 
 
 st.set_page_config(
@@ -126,6 +131,47 @@ def get_route_prediction_data():
     return pd.DataFrame(data)
 
 
+def poll_job(state_key, title, label):
+    job_id = st.session_state[state_key]
+    if st.button("Cancel", key=f"cancel_{state_key}"):
+        try:
+            requests.delete(f"{API_URL}/jobs/{job_id}", timeout=REQUEST_TIMEOUT)
+            st.warning(f"Cancelled {label}.")
+        except Exception as e:
+            st.error(f"Failed to cancel {label}: {str(e)}")
+        st.session_state[state_key] = None
+        return
+    progress_bar = st.progress(0.0)
+    partial_box = st.empty()
+    while True:
+        try:
+            res = requests.get(f"{API_URL}/jobs/{job_id}", timeout=REQUEST_TIMEOUT)
+        except Exception as e:
+            st.error(f"Failed to poll {label}: {str(e)}")
+            return
+        if res.status_code != 200:
+            st.error(f"Error: {res.status_code} - {res.text}")
+            st.session_state[state_key] = None
+            return
+        job = res.json()
+        progress_bar.progress(job["progress"], text=f"{label.capitalize()}: {job['status']} ({job['progress'] * 100:.0f}%)")
+        if job["partial"] and job["status"] == "running":
+            with partial_box.container():
+                st.caption("Best result so far")
+                st.json(job["partial"])
+        if job["status"] == "done":
+            partial_box.empty()
+            st.success(title)
+            st.json(job["result"])
+            st.session_state[state_key] = None
+            return
+        if job["status"] in ("failed", "cancelled"):
+            st.error(f"{label.capitalize()} {job['status']}: {job['error'] or ''}")
+            st.session_state[state_key] = None
+            return
+        time.sleep(POLL_INTERVAL)
+
+
 def shipment_simulation_page():
     st.header("Shipment Input & Route Simulation")
     st.markdown("Enter shipment details and simulate multi-modal routes.")
@@ -157,7 +203,7 @@ def shipment_simulation_page():
                     "shipping_date": shipping_date.strftime("%Y-%m-%d")
                 }
                 try:
-                    res = requests.post("http://localhost:5000/shipment", json=data)
+                    res = requests.post(f"{API_URL}/shipment", json=data, timeout=REQUEST_TIMEOUT)
                     if res.status_code == 200:
                         st.success("Shipment submitted successfully!")
                         st.json(res.json())
@@ -172,7 +218,7 @@ def shipment_simulation_page():
         if st.button("Simulate Routes"):
             with st.spinner("Simulating routes..."):
                 try:
-                    res = requests.post("http://localhost:5000/simulate", json={"origin": sim_origin, "destination": sim_destination})
+                    res = requests.post(f"{API_URL}/simulate", json={"origin": sim_origin, "destination": sim_destination}, timeout=REQUEST_TIMEOUT)
                     if res.status_code == 200:
                         routes = res.json().get("routes", [])
                         st.info("Simulated Multi-Modal Routes")
@@ -200,28 +246,31 @@ def quantum_annealing_page():
             q_transport_modes = st.multiselect("Preferred Transport Modes", ["Air", "Sea", "Land"], default=["Air", "Land"])
             q_shipping_date = st.date_input("Shipping Date", date.today())
         
+        q_iterations = st.number_input("Annealing Iterations", min_value=10, step=10, value=100)
+        
         q_submitted = st.form_submit_button("Run Quantum Optimization")
         if q_submitted:
-            with st.spinner("Running quantum optimization..."):
-                data = {
-                    "shipment_id": q_shipment_id,
-                    "origin": q_origin,
-                    "destination": q_destination,
-                    "weight": q_weight,
-                    "volume": q_volume,
-                    "cargo_type": q_cargo_type,
-                    "transport_modes": q_transport_modes,
-                    "shipping_date": q_shipping_date.strftime("%Y-%m-%d")
-                }
-                try:
-                    res = requests.post("http://localhost:5000/quantum_analysis", json=data)
-                    if res.status_code == 200:
-                        st.success("Quantum Optimization Report")
-                        st.json(res.json())
-                    else:
-                        st.error(f"Error: {res.status_code} - {res.text}")
-                except Exception as e:
-                    st.error(f"Failed to run quantum optimization: {str(e)}")
+            data = {
+                "shipment_id": q_shipment_id,
+                "origin": q_origin,
+                "destination": q_destination,
+                "weight": q_weight,
+                "volume": q_volume,
+                "cargo_type": q_cargo_type,
+                "transport_modes": q_transport_modes,
+                "shipping_date": q_shipping_date.strftime("%Y-%m-%d"),
+                "iterations": q_iterations
+            }
+            try:
+                res = requests.post(f"{API_URL}/jobs/quantum_analysis", json=data, timeout=REQUEST_TIMEOUT)
+                if res.status_code == 202:
+                    st.session_state["quantum_job"] = res.json()["job_id"]
+                else:
+                    st.error(f"Error: {res.status_code} - {res.text}")
+            except Exception as e:
+                st.error(f"Failed to run quantum optimization: {str(e)}")
+    if st.session_state.get("quantum_job"):
+        poll_job("quantum_job", "Quantum Optimization Report", "quantum optimization")
 
 
 def fuzzy_logic_page():
@@ -235,7 +284,7 @@ def fuzzy_logic_page():
         if f_submitted:
             with st.spinner("Ranking routes..."):
                 try:
-                    res = requests.post("http://localhost:5000/fuzzy_logic_ranking", json={"origin": f_origin, "destination": f_destination})
+                    res = requests.post(f"{API_URL}/fuzzy_logic_ranking", json={"origin": f_origin, "destination": f_destination}, timeout=REQUEST_TIMEOUT)
                     if res.status_code == 200:
                         st.success("Fuzzy Logic Ranked Routes")
                         st.json(res.json())
@@ -260,7 +309,7 @@ def deep_route_prediction_page():
             features = [feature1, feature2, feature3, feature4]
             with st.spinner("Predicting route quality..."):
                 try:
-                    res = requests.post("http://localhost:5000/ml_predict", json={"features": features})
+                    res = requests.post(f"{API_URL}/ml_predict", json={"features": features}, timeout=REQUEST_TIMEOUT)
                     if res.status_code == 200:
                         ml_pred = res.json().get("ml_prediction", 0.0)
                         st.success(f"Predicted Route Quality Score: {ml_pred:.2f}")
@@ -275,6 +324,20 @@ def dashboard_page():
     st.markdown("Monitor and analyze your cross-border shipment performance.")
 
     
+    with st.expander("Route Score Statistics", expanded=False):
+        samples = st.number_input("Sample Shipments", min_value=1, max_value=10000, step=10, value=10)
+        if st.button("Compute Statistics"):
+            try:
+                res = requests.post(f"{API_URL}/jobs/stats", json={"samples": samples}, timeout=REQUEST_TIMEOUT)
+                if res.status_code == 202:
+                    st.session_state["stats_job"] = res.json()["job_id"]
+                else:
+                    st.error(f"Error: {res.status_code} - {res.text}")
+            except Exception as e:
+                st.error(f"Failed to compute statistics: {str(e)}")
+        if st.session_state.get("stats_job"):
+            poll_job("stats_job", "Route Score Statistics", "statistics run")
+
     df_shipment = get_shipment_data()
     df_quantum = get_quantum_optimization_data()
     df_fuzzy = get_fuzzy_ranking_data()